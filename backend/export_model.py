@@ -0,0 +1,58 @@
+# ===================================================================================
+# export_model.py: SENTINEL-X - Offline Model Export ⚡
+# Converts the accident detection weights into accelerated inference formats
+# ===================================================================================
+#
+# Run once on the deployment machine (TensorRT engines are tied to the GPU/driver):
+#
+#   python export_model.py                  # FP16 TensorRT engine (GPU)
+#   python export_model.py --onnx           # ONNX for CPU-only / ONNXRuntime edge boxes
+#
+# main.py automatically prefers newbest.engine, then newbest.onnx, then newbest.pt.
+#
+# Note: the pinned ultralytics (8.0.207) builds TensorRT engines in FP32 or FP16 only;
+# it has no INT8 calibration path, so the engine is exported with half=True.
+
+import argparse
+import torch
+from ultralytics import YOLO
+
+# PyTorch 2.6+ compatibility fix for loading model weights (same as main.py)
+_original_load = torch.load
+def _patched_load(*args, **kwargs):
+    kwargs['weights_only'] = False
+    return _original_load(*args, **kwargs)
+torch.load = _patched_load
+
+WEIGHTS_PATH = "weights/models/newbest.pt"
+IMG_SIZE = 640
+
+
+def export_tensorrt_fp16(weights):
+    """Export an FP16 TensorRT engine (newbest.engine) for the local GPU"""
+    model = YOLO(weights)
+    path = model.export(format="engine", half=True, imgsz=IMG_SIZE)
+    print(f"✅ TensorRT FP16 engine written to: {path}")
+    return path
+
+
+def export_onnx(weights):
+    """Export a dynamic-shape ONNX model (newbest.onnx) for ONNXRuntime"""
+    model = YOLO(weights)
+    path = model.export(format="onnx", dynamic=True, simplify=True, imgsz=IMG_SIZE)
+    print(f"✅ ONNX model written to: {path}")
+    return path
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export SENTINEL-X detector to TensorRT / ONNX")
+    parser.add_argument("--weights", default=WEIGHTS_PATH, help="Source .pt weights")
+    parser.add_argument("--onnx", action="store_true", help="Export ONNX instead of TensorRT (CPU-only hosts)")
+    args = parser.parse_args()
+
+    if args.onnx or not torch.cuda.is_available():
+        if not args.onnx:
+            print("⚠️ No CUDA device found, exporting ONNX instead of TensorRT...")
+        export_onnx(args.weights)
+    else:
+        export_tensorrt_fp16(args.weights)
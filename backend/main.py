@@ -4,12 +4,17 @@
 # ===================================================================================
 
 import cv2
+import numpy as np
 import asyncio
 import uvicorn
 import time
-import requests
+import httpx
 import json
+import orjson
 import threading
+import concurrent.futures
+import atexit
+import logging
 import os
 from datetime import datetime
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
@@ -21,6 +26,16 @@ from collections import deque
 # Load environment variables
 load_dotenv()
 
+# Per-detection debug output goes through logging so it costs nothing unless enabled
+# (run with SENTINEL_LOG_LEVEL=DEBUG to see every detection)
+log = logging.getLogger("sentinel")
+log.setLevel(os.getenv("SENTINEL_LOG_LEVEL", "INFO").upper())
+if not log.handlers:  # main.py is the entry point, so it installs the handler itself
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter("%(message)s"))
+    log.addHandler(_log_handler)
+    log.propagate = False
+
 # PyTorch 2.6+ compatibility fix for loading model weights
 import torch
 _original_load = torch.load
@@ -29,9 +44,16 @@ def _patched_load(*args, **kwargs):
     return _original_load(*args, **kwargs)
 torch.load = _patched_load
 
+# Inference only: skip autograd bookkeeping, and let cuDNN autotune convs for the fixed frame size
+torch.set_grad_enabled(False)
+torch.backends.cudnn.benchmark = True
+USE_HALF = torch.cuda.is_available()  # FP16 on GPU for .pt weights (tensor cores, half the memory bandwidth)
+
 # --- ⚙️ CONFIGURATION ---
 # UPDATE THIS with your IP Webcam IP
 MOBILE_CAMERA_URL = os.getenv("CAMERA_URL", "your-camera-url-here")
+# Camera resolution (WIDTH x HEIGHT): the model is warmed up on frames of this shape
+CAMERA_FRAME_W, CAMERA_FRAME_H = (int(v) for v in os.getenv("CAMERA_FRAME_SIZE", "1280x720").lower().split("x"))
 
 # --- 🔑 CREDENTIALS ---
 # IBM Cloud API Key
@@ -53,23 +75,28 @@ EVIDENCE_DIR = "evidence_archive"
 os.makedirs(os.path.join(EVIDENCE_DIR, "crashes"), exist_ok=True)
 
 # --- 🆕 FEATURE 1: SEVERITY CALCULATION ---
-def calculate_accident_severity(vehicle_count, confidence, labels):
+SEVERITY_NAMES = ("MINOR", "MODERATE", "SEVERE")
+CRASH_KEYWORDS = ["crash", "accident", "severe", "collision", "damage"]
+
+def _severity_index(vehicle_count, confidence, has_crash):
+    """Index into SEVERITY_NAMES (plain Python: a JIT dispatcher call costs more than these compares)"""
+    if vehicle_count >= 3 or (has_crash and vehicle_count >= 2 and confidence > 0.7):
+        return 2
+    elif vehicle_count == 2 and has_crash:
+        return 1
+    return 0
+
+def calculate_accident_severity(vehicle_count, confidence, has_crash):
     """
     Calculate accident severity: MINOR, MODERATE, or SEVERE
+    has_crash: whether any detected class matches CRASH_KEYWORDS (see HAS_CRASH_CLS)
     
     Rules:
     - SEVERE: 3+ vehicles OR high confidence crash + multiple vehicles
     - MODERATE: 2 vehicles + crash detection
     - MINOR: 1 vehicle OR low confidence
     """
-    has_crash = any(k in str(labels).lower() for k in ["crash", "accident", "severe", "collision", "damage"])
-    
-    if vehicle_count >= 3 or (has_crash and vehicle_count >= 2 and confidence > 0.7):
-        return "SEVERE"
-    elif vehicle_count == 2 and has_crash:
-        return "MODERATE"
-    else:
-        return "MINOR"
+    return SEVERITY_NAMES[_severity_index(vehicle_count, confidence, has_crash)]
 
 # --- 🆕 FEATURE 2: VEHICLE TYPE CLASSIFICATION ---
 VEHICLE_TYPES = {
@@ -93,30 +120,83 @@ def classify_vehicle_type(label):
 # --- 🆕 FEATURE 3: INCIDENT HEATMAP TRACKING ---
 class HeatmapTracker:
     """Track incident locations for heatmap"""
-    def __init__(self, max_history=100):
-        self.incidents = deque(maxlen=max_history)
+    def __init__(self, max_history=100, cell_size_deg=0.001, max_hotspots=50):
+        self.cell_size_deg = cell_size_deg  # Grid cell edge (0.001° ≈ 110 m)
+        self.max_hotspots = max_hotspots
+        # Structure-of-arrays ring buffer: ~25 bytes per incident instead of a dict + strings
+        self.max_history = max_history
+        # float64 so coordinates round-trip exactly (float32 would send 15.458900451660156 for 15.4589)
+        self._lat = np.empty(max_history, dtype=np.float64)
+        self._lon = np.empty(max_history, dtype=np.float64)
+        self._sev = np.empty(max_history, dtype=np.int8)   # Index into SEVERITY_NAMES
+        self._ts = np.empty(max_history, dtype=np.int64)   # Unix seconds
+        self._head = 0  # Next slot to write
+        self._len = 0
+        self.version = 0  # Bumped on every change so subscribers only re-send on updates
+        self._cached_list = []
+        self._dirty = False
     
     def add_incident(self, lat, lon, severity):
-        self.incidents.append({
-            "lat": lat,
-            "lon": lon,
-            "severity": severity,
-            "timestamp": datetime.now().isoformat()
-        })
+        i = self._head
+        self._lat[i] = lat
+        self._lon[i] = lon
+        self._sev[i] = SEVERITY_NAMES.index(severity)
+        self._ts[i] = int(time.time())
+        self._head = (i + 1) % self.max_history
+        self._len = min(self._len + 1, self.max_history)
+        self.version += 1
+        self._dirty = True
+
+    def arrays(self):
+        """Return (lat, lon, severity index, timestamp) arrays, oldest first (views until the ring wraps)"""
+        if self._len < self.max_history:
+            n = self._len
+            return self._lat[:n], self._lon[:n], self._sev[:n], self._ts[:n]
+        order = np.roll(np.arange(self.max_history), -self._head)
+        return self._lat[order], self._lon[order], self._sev[order], self._ts[order]
     
     def get_hotspots(self):
-        """Return clustered incident locations"""
-        if not self.incidents:
+        """
+        Return clustered incident locations (rebuilt only after a new incident)
+        Incidents are bucketed on a lat/lon grid; each cell reports its mean location,
+        incident count, worst severity and latest time, busiest cells first.
+        """
+        if self._dirty:
+            self._cached_list = self._cluster()
+            self._dirty = False
+        return self._cached_list
+
+    def _cluster(self):
+        lat, lon, sev, ts = self.arrays()
+        if len(lat) == 0:
             return []
-        
-        hotspots = []
-        for incident in self.incidents:
-            hotspots.append({
-                "location": [incident["lat"], incident["lon"]],
-                "severity": incident["severity"],
-                "time": incident["timestamp"]
-            })
-        return hotspots
+
+        cells = np.stack([
+            np.floor(lat / self.cell_size_deg).astype(np.int64),
+            np.floor(lon / self.cell_size_deg).astype(np.int64)
+        ], axis=1)
+        _, inverse = np.unique(cells, axis=0, return_inverse=True)
+        inverse = inverse.reshape(-1)
+
+        counts = np.bincount(inverse)
+        mean_lat = np.bincount(inverse, weights=lat) / counts
+        mean_lon = np.bincount(inverse, weights=lon) / counts
+        max_sev = np.zeros(len(counts), dtype=np.int8)
+        np.maximum.at(max_sev, inverse, sev)
+        last_ts = np.zeros(len(counts), dtype=np.int64)
+        np.maximum.at(last_ts, inverse, ts)
+
+        top = np.argsort(-counts, kind="stable")[:self.max_hotspots]
+        return [
+            {
+                # 6 decimals (~0.1 m) hides the float noise of the mean sum
+                "location": [round(float(mean_lat[c]), 6), round(float(mean_lon[c]), 6)],
+                "severity": SEVERITY_NAMES[max_sev[c]],
+                "count": int(counts[c]),
+                "time": datetime.fromtimestamp(int(last_ts[c])).isoformat()
+            }
+            for c in top.tolist()
+        ]
 
 heatmap_tracker = HeatmapTracker()
 
@@ -145,17 +225,35 @@ class QueueEstimator:
             return signal_cycle_time
         return max(0, estimated_wait)
 
+# --- 🌐 HTTP CLIENT ---
+# One async client for IBM + Telegram: keepalive + HTTP/2 multiplexing, no thread per alert
+HTTP_CLIENT = httpx.AsyncClient(
+    http2=True,
+    timeout=15,
+    limits=httpx.Limits(max_connections=8, max_keepalive_connections=4)
+)
+
 # --- 🧠 IBM CONNECTION LOGIC ---
-def get_ibm_token():
-    """Exchanges API Key for a Bearer Token"""
+IBM_TOKEN_REFRESH_MARGIN = 60  # Refresh the bearer token this many seconds before it expires
+_ibm_token_cache = {"token": None, "exp": 0}
+
+async def get_ibm_token():
+    """Exchanges API Key for a Bearer Token (cached until shortly before expiry)"""
+    if _ibm_token_cache["token"] and time.time() < _ibm_token_cache["exp"] - IBM_TOKEN_REFRESH_MARGIN:
+        return _ibm_token_cache["token"]
+
     try:
         url = "https://iam.cloud.ibm.com/identity/token"
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         data = f"grant_type=urn:ibm:params:oauth:grant-type:apikey&apikey={IBM_API_KEY}"
         
-        response = requests.post(url, headers=headers, data=data)
+        response = await HTTP_CLIENT.post(url, headers=headers, content=data)
         if response.status_code == 200:
-            return response.json().get("access_token")
+            token_data = response.json()
+            _ibm_token_cache["token"] = token_data.get("access_token")
+            # IAM returns an absolute 'expiration'; fall back to 'expires_in' (~1h)
+            _ibm_token_cache["exp"] = token_data.get("expiration") or time.time() + token_data.get("expires_in", 3600)
+            return _ibm_token_cache["token"]
         else:
             print(f"❌ Auth Failed: {response.text}")
             return None
@@ -163,21 +261,41 @@ def get_ibm_token():
         print(f"❌ Auth Exception: {e}")
         return None
 
-def trigger_ibm_agent(confidence, severity="HIGH", vehicle_count=1, location="Pune_Main_Road"):
+_ibm_in_flight = False  # An IBM trigger is currently awaiting IAM / the agent
+ibm_active_until = 0.0  # Dashboards report the IBM agent as "active" until this time
+
+def ibm_trigger_due():
+    """True when no IBM call is running and the cooldown has passed"""
+    return not _ibm_in_flight and time.time() - last_ibm_trigger_time >= IBM_COOLDOWN
+
+def ibm_agent_status():
+    """Shared IBM status for every /ws connection (the trigger runs as a task, not per socket)"""
+    return "active" if time.time() < ibm_active_until else "idle"
+
+async def trigger_ibm_agent(confidence, severity="HIGH", vehicle_count=1, location="Pune_Main_Road"):
     """
     Sends a message to your IBM Agent to trigger the accident workflow.
     Now includes severity level and vehicle count.
     """
-    global last_ibm_trigger_time
+    global _ibm_in_flight
     
-    # 1. Check Cooldown
-    if time.time() - last_ibm_trigger_time < IBM_COOLDOWN:
+    # 1. Check Cooldown, and claim the call before the first await so concurrent /ws loops
+    # can't both pass the check while this one is waiting on IBM
+    if not ibm_trigger_due():
         return {"status": "cooldown"}
+    _ibm_in_flight = True
+    try:
+        return await _send_ibm_alert(confidence, severity, vehicle_count, location)
+    finally:
+        _ibm_in_flight = False
+
+async def _send_ibm_alert(confidence, severity, vehicle_count, location):
+    global last_ibm_trigger_time, ibm_active_until
 
     print(f"🚀 CALLING IBM WATSONX AGENT...")
 
     # 2. Get Auth Token
-    token = get_ibm_token()
+    token = await get_ibm_token()
     if not token:
         return {"status": "auth_failed"}
 
@@ -208,7 +326,7 @@ def trigger_ibm_agent(confidence, severity="HIGH", vehicle_count=1, location="Pu
     }
 
     try:
-        response = requests.post(url, json=payload, headers=headers)
+        response = await HTTP_CLIENT.post(url, json=payload, headers=headers)
         if response.status_code == 200:
             response_data = response.json()
             agent_text = "Alert Processed"
@@ -218,6 +336,7 @@ def trigger_ibm_agent(confidence, severity="HIGH", vehicle_count=1, location="Pu
                 pass
             print(f"✅ IBM AGENT RESPONDED: {agent_text}")
             last_ibm_trigger_time = time.time()
+            ibm_active_until = last_ibm_trigger_time + IBM_ACTIVE_WINDOW
             return {"status": "triggered"}
         else:
             print(f"❌ IBM Error {response.status_code}: {response.text}")
@@ -227,14 +346,60 @@ def trigger_ibm_agent(confidence, severity="HIGH", vehicle_count=1, location="Pu
         return {"status": "error"}
 
 # --- 📸 EVIDENCE & TELEGRAM LOGIC ---
-def handle_alert_background(title, message, frame_copy, severity="NONE"):
+# JPEG quality by severity: full detail for severe crashes, smaller uploads for minor ones
+EVIDENCE_JPEG_QUALITY = {"SEVERE": 95, "MODERATE": 85, "MINOR": 75}
+
+# Fixed pool for evidence encoding / disk writes: caps concurrent work during alert bursts
+# and keeps it off the inference thread (INFERENCE_POOL)
+ALERT_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix="alert")
+atexit.register(ALERT_POOL.shutdown, wait=True)
+
+async def _run_in_alert_pool(fn, *args):
+    return await asyncio.get_running_loop().run_in_executor(ALERT_POOL, fn, *args)
+
+def _encode_jpeg(frame, quality):
+    ok, buf = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buf.tobytes() if ok else None
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
+
+async def save_evidence(filepath, jpeg_bytes):
+    """Write the already-encoded evidence image to the archive"""
+    try:
+        await _run_in_alert_pool(_write_bytes, filepath, jpeg_bytes)
+        print(f"✅ Image Saved: {filepath} ({len(jpeg_bytes)} bytes)", flush=True)
+    except Exception as e:
+        print(f"❌ Failed to save image to {filepath}: {type(e).__name__}: {e}", flush=True)
+
+async def send_telegram_photo(filename, jpeg_bytes, caption):
+    """Upload the in-memory evidence image to Telegram"""
+    url_photo = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendPhoto"
+    try:
+        print(f"📤 Sending photo to Telegram...", flush=True)
+        response = await HTTP_CLIENT.post(
+            url_photo,
+            data={"chat_id": TELEGRAM_CHAT_ID, "caption": caption},
+            files={"photo": (filename, jpeg_bytes, "image/jpeg")}
+        )
+        if response.status_code == 200:
+            print(f"✅ Photo sent successfully to Telegram! Message ID: {response.json().get('result', {}).get('message_id', 'N/A')}", flush=True)
+        else:
+            print(f"⚠️ Photo send failed: {response.status_code}", flush=True)
+            print(f"Response: {response.text}", flush=True)
+    except Exception as e:
+        print(f"❌ Photo send error: {type(e).__name__}: {e}", flush=True)
+
+async def handle_alert_background_async(title, message, frame_copy, severity="NONE"):
     """
-    Saves image and sends to Telegram in a separate thread to avoid lag.
+    Saves image and sends to Telegram as a task on the event loop to avoid lag.
+    The frame is JPEG-encoded once in memory; the disk write and upload run concurrently.
     Now includes severity level in the alert.
     """
     print(f"📸 [EVIDENCE] Saving proof and sending to Telegram...", flush=True)
     try:
-        # 1. Save Image Locally
+        # 1. Encode Image
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"evidence_{timestamp}_{severity}_crash.jpg"
         filepath = os.path.join(EVIDENCE_DIR, "crashes", filename)
@@ -244,44 +409,27 @@ def handle_alert_background(title, message, frame_copy, severity="NONE"):
             print(f"❌ Frame is invalid/empty, cannot save", flush=True)
             return
         
-        success = cv2.imwrite(filepath, frame_copy)
-        if success:
-            file_size = os.path.getsize(filepath)
-            print(f"✅ Image Saved: {filepath} ({file_size} bytes)", flush=True)
-        else:
-            print(f"❌ Failed to save image to {filepath}", flush=True)
+        quality = EVIDENCE_JPEG_QUALITY.get(severity, 85)
+        jpeg_bytes = await _run_in_alert_pool(_encode_jpeg, frame_copy, quality)
+        if jpeg_bytes is None:
+            print(f"❌ Failed to encode evidence image", flush=True)
             return
 
-        # 2. Send Photo to Telegram (WITH ERROR CHECKING)
+        # 2. Save Locally + Send Photo to Telegram (concurrently)
         severity_emoji = "🔴" if severity == "SEVERE" else "🟡" if severity == "MODERATE" else "🟢"
         caption = f"🚨 SENTINEL-X ALERT: {title}\n{severity_emoji} Severity: {severity}\nInfo: {message}\nTime: {timestamp}"
-        url_photo = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendPhoto"
-        
-        try:
-            print(f"📤 Sending photo to Telegram...", flush=True)
-            with open(filepath, "rb") as img_file:
-                response = requests.post(
-                    url_photo,
-                    data={"chat_id": TELEGRAM_CHAT_ID, "caption": caption},
-                    files={"photo": img_file},
-                    timeout=15
-                )
-                if response.status_code == 200:
-                    print(f"✅ Photo sent successfully to Telegram! Message ID: {response.json().get('result', {}).get('message_id', 'N/A')}", flush=True)
-                else:
-                    print(f"⚠️ Photo send failed: {response.status_code}", flush=True)
-                    print(f"Response: {response.text}", flush=True)
-        except Exception as e:
-            print(f"❌ Photo send error: {type(e).__name__}: {e}", flush=True)
+        await asyncio.gather(
+            save_evidence(filepath, jpeg_bytes),
+            send_telegram_photo(filename, jpeg_bytes, caption)
+        )
 
         # 3. Send Location
         url_loc = f"https://api.telegram.org/bot{TELEGRAM_BOT_TOKEN}/sendLocation"
         try:
             print(f"📍 Sending location to Telegram...", flush=True)
-            response = requests.post(
+            response = await HTTP_CLIENT.post(
                 url_loc,
-                data={"chat_id": TELEGRAM_CHAT_ID, "latitude": CAMERA_LAT, "longitude": CAMERA_LON},
-                timeout=15
+                data={"chat_id": TELEGRAM_CHAT_ID, "latitude": CAMERA_LAT, "longitude": CAMERA_LON}
             )
             if response.status_code == 200:
                 print("✅ Location sent successfully!", flush=True)
@@ -295,6 +443,20 @@ def handle_alert_background(title, message, frame_copy, severity="NONE"):
     except Exception as e:
         print(f"❌ Telegram/Save Error: {type(e).__name__}: {e}", flush=True)
 
+# Strong references to in-flight alert tasks (the event loop only keeps weak ones)
+_alert_tasks = set()
+
+def schedule_task(coro):
+    """Run an alert coroutine (IBM / evidence / Telegram) concurrently with the WebSocket loop"""
+    task = asyncio.create_task(coro)
+    _alert_tasks.add(task)
+    task.add_done_callback(_alert_tasks.discard)
+    return task
+
+def schedule_alert(*args):
+    """Run an evidence/Telegram alert concurrently with the WebSocket loop"""
+    return schedule_task(handle_alert_background_async(*args))
+
 # --- 🚀 FASTAPI & YOLO SETUP ---
 app = FastAPI()
 app.add_middleware(
@@ -305,20 +467,175 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@app.on_event("shutdown")
+async def shutdown_http_client():
+    # Let pending alerts finish sending before closing the connection pool
+    if _alert_tasks:
+        await asyncio.gather(*_alert_tasks, return_exceptions=True)
+    await HTTP_CLIENT.aclose()
+
 # Load Model
-try:
-    # TRY LOADING YOUR CUSTOM MODEL FIRST
-    model = YOLO("weights/models/newbest.pt")
-    print("✅ Loaded custom accident detection model")
-except:
+# Accelerated exports (see export_model.py) are preferred over the raw PyTorch weights
+MODEL_CANDIDATES = [
+    "weights/models/newbest.engine",  # TensorRT FP16 (GPU)
+    "weights/models/newbest.onnx",    # ONNXRuntime (CUDA / CPU execution providers)
+    "weights/models/newbest.pt",      # Original PyTorch weights
+]
+
+IMG_SIZE = 640  # Model input size (long side)
+
+def use_half_for(path):
+    """
+    FP16 input only for PyTorch weights: exported models keep their baked-in precision, and
+    AutoBackend would otherwise feed .half() tensors to an FP32 ONNX session (rejected by ORT)
+    """
+    return USE_HALF and path.endswith(".pt")
+
+def predict(detector, frame, half):
+    """Run a YOLO model on a single prepared frame"""
+    # Grad mode is thread-local, so inference_mode has to be entered in the calling thread
+    with torch.inference_mode():
+        # Lowered confidence to 0.4 to catch more potential accidents
+        return detector(frame, verbose=False, conf=0.4, half=half, imgsz=IMG_SIZE)
+
+def load_detection_model():
+    """
+    Load the fastest available custom model, falling back to standard yolov8n
+    Returns (model, half) where half tells whether to request FP16 inference.
+    """
+    probe_frame = np.zeros((IMG_SIZE, IMG_SIZE, 3), dtype=np.uint8)
+    for path in MODEL_CANDIDATES:
+        if not os.path.exists(path):
+            continue
+        try:
+            loaded = YOLO(path, task="detect")
+            half = use_half_for(path)
+            # Exported formats only deserialize the TensorRT engine / create the ONNXRuntime
+            # session on the first predict, so probe here to fall through on an incompatible export
+            predict(loaded, probe_frame, half)
+            print(f"✅ Loaded custom accident detection model: {path}")
+            return loaded, half
+        except Exception as e:
+            print(f"⚠️ Could not load '{path}': {e}")
     print("⚠️ Custom model 'weights/models/newbest.pt' not found, loading standard 'yolov8n.pt'...")
-    model = YOLO("yolov8n.pt")
+    return YOLO("yolov8n.pt"), use_half_for("yolov8n.pt")
+
+model, MODEL_HALF = load_detection_model()
+
+def prepare_frame(frame):
+    """
+    Downscale a camera frame to IMG_SIZE on its long side (aspect preserved) in one OpenCV call.
+    Returns (model_input, scale) where scale maps model coords back to the original frame.
+    """
+    h, w = frame.shape[:2]
+    scale = IMG_SIZE / max(h, w)
+    if scale >= 1.0:
+        return frame, 1.0
+    small = cv2.resize(frame, (round(w * scale), round(h * scale)), interpolation=cv2.INTER_LINEAR)
+    return small, scale
+
+# The shared model's predictor keeps per-call state (batch, results, dataset) and has no lock,
+# so every /ws connection runs inference through this one worker thread
+INFERENCE_POOL = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="inference")
+atexit.register(INFERENCE_POOL.shutdown, wait=True)
+
+def run_inference(frame):
+    """Run the loaded model on a single prepared frame (called on INFERENCE_POOL)"""
+    return predict(model, frame, MODEL_HALF)
+
+# Warm-up: pay CUDA context init / cuDNN autotune / kernel JIT before the first client connects.
+# cudnn.benchmark re-tunes for every new input shape, so warm up on the shape prepare_frame
+# produces for the camera rather than on a square dummy
+WARMUP_RUNS = 3
+_dummy_frame, _ = prepare_frame(np.zeros((CAMERA_FRAME_H, CAMERA_FRAME_W, 3), dtype=np.uint8))
+for _ in range(WARMUP_RUNS):
+    run_inference(_dummy_frame)
+print(f"🔥 Model warmed up ({WARMUP_RUNS} dummy inferences, {_dummy_frame.shape[1]}x{_dummy_frame.shape[0]} input)")
+
+# Class-id lookup tables: model.names is fixed after load, so classify each label once
+CLASS_LABELS = [model.names[i] for i in range(len(model.names))]
+VEHICLE_TYPE_NAMES = list(VEHICLE_TYPES) + ["other"]
+OTHER_TYPE_ID = len(VEHICLE_TYPE_NAMES) - 1
+TYPE_OF_CLS = [classify_vehicle_type(label) for label in CLASS_LABELS]
+VEHICLE_TYPE_LUT = np.array([VEHICLE_TYPE_NAMES.index(t) for t in TYPE_OF_CLS], dtype=np.int8)
+
+# 🚨 TRIGGER KEYWORDS - resolved to class ids once so the hot path is a set lookup
+CRITICAL_KEYWORDS = ["accident", "crash", "car_crash", "damage", "wreck", "severe", "collision"]
+SUPPORTING_KEYWORDS = ["car", "vehicle", "person"]
+
+CRITICAL_CLS_IDS = {cid for cid, label in enumerate(CLASS_LABELS) if any(k in label.lower() for k in CRITICAL_KEYWORDS)}
+SUPPORTING_CLS_IDS = {cid for cid, label in enumerate(CLASS_LABELS) if any(k in label.lower() for k in SUPPORTING_KEYWORDS)}
+
+# Severity input: which classes count as a crash
+HAS_CRASH_CLS = np.array([any(k in label.lower() for k in CRASH_KEYWORDS) for label in CLASS_LABELS], dtype=bool)
+
+# Boolean masks over class ids for the vectorized trigger check
+CRITICAL_CLS_MASK = np.zeros(len(CLASS_LABELS), dtype=bool)
+CRITICAL_CLS_MASK[list(CRITICAL_CLS_IDS)] = True
+SUPPORTING_CLS_MASK = np.zeros(len(CLASS_LABELS), dtype=bool)
+SUPPORTING_CLS_MASK[list(SUPPORTING_CLS_IDS)] = True
+
+EMPTY_CLS = np.empty(0, dtype=np.int32)
+EMPTY_CONF = np.empty(0, dtype=np.float32)
+EMPTY_XYXY = np.empty((0, 4), dtype=np.float32)
+
+def summarize_detections(clss, confs):
+    """
+    Single vectorized sweep over one frame's boxes.
+    Returns (vehicle counts per type, total vehicles, has_crash, trigger mask, highest trigger conf)
+    """
+    type_ids = VEHICLE_TYPE_LUT[clss]
+    vehicle_mask = type_ids != OTHER_TYPE_ID  # "other" detections are not counted as vehicles
+    counts_by_type = np.bincount(type_ids[vehicle_mask], minlength=OTHER_TYPE_ID)
+
+    # 🚨 TRIGGER CONDITION - SMART CONFIDENCE THRESHOLDS
+    # High-confidence trigger: Critical keywords with >40% confidence
+    # Lower-confidence trigger: Supporting keywords need >70% confidence
+    trigger = (CRITICAL_CLS_MASK[clss] & (confs > 0.4)) | (SUPPORTING_CLS_MASK[clss] & (confs > 0.7))
+    highest_conf = float(confs[trigger].max()) if trigger.any() else 0.0
+
+    return counts_by_type, int(vehicle_mask.sum()), bool(HAS_CRASH_CLS[clss].any()), trigger, highest_conf
+
+# --- 🎥 CAMERA GRABBER ---
+def _grabber(cap, latest, stop_event):
+    """
+    Decode camera frames as fast as possible, keeping only the newest one (drop, don't queue)
+    The grabber owns the capture and releases it on exit, so it is never released mid-read.
+    """
+    try:
+        while not stop_event.is_set():
+            ret, f = cap.read()
+            if ret:
+                latest.append(f)
+            else:
+                time.sleep(0.5)  # Stream hiccup: back off before retrying
+    finally:
+        cap.release()
 
 # Global State
 last_ibm_trigger_time = 0
 last_snapshot_time = 0
 IBM_COOLDOWN = 60       # IBM Agent Cooldown
+IBM_ACTIVE_WINDOW = 5   # Seconds dashboards show the IBM agent as "active" after a trigger
 SNAPSHOT_COOLDOWN = 15  # Evidence Saving Cooldown
+WS_SEND_INTERVAL = 0.1  # Max dashboard update rate (10 Hz); state changes are sent immediately
+HEATMAP_POLL_INTERVAL = 0.5  # How often /ws/heatmap checks for new incidents
+
+# Motion gate: YOLO only runs when the scene changed since the last inferred frame
+MOTION_THUMB_SIZE = (160, 90)  # Tiny greyscale thumbnail, ~0.5 ms to compare
+MOTION_PIXEL_THRESHOLD = 15    # Grey-level change that counts as a moving pixel
+MOTION_MIN_FRACTION = 0.01     # Fraction of moving pixels needed to run inference
+
+def motion_thumbnail(frame):
+    return cv2.cvtColor(cv2.resize(frame, MOTION_THUMB_SIZE), cv2.COLOR_BGR2GRAY)
+
+def motion_fraction(thumb, reference):
+    """Fraction of thumbnail pixels that changed noticeably since the reference"""
+    return np.count_nonzero(cv2.absdiff(thumb, reference) > MOTION_PIXEL_THRESHOLD) / thumb.size
+
+def ws_dumps(payload):
+    """Serialize a WebSocket payload with orjson (numpy arrays/scalars are encoded natively)"""
+    return orjson.dumps(payload, option=orjson.OPT_SERIALIZE_NUMPY)
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
@@ -329,119 +646,176 @@ async def websocket_endpoint(websocket: WebSocket):
     print(f"📷 Connecting to camera: {MOBILE_CAMERA_URL}")
     
     cap = cv2.VideoCapture(MOBILE_CAMERA_URL)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+
+    # Camera decoding runs in its own thread; the loop always processes the freshest frame
+    latest = deque(maxlen=1)
+    stop_grabber = threading.Event()
+    grabber = threading.Thread(target=_grabber, args=(cap, latest, stop_grabber), daemon=True)
+    grabber.start()
+
+    last_sent = 0.0
+    last_accident = False
+    reference_thumb = None  # Thumbnail of the last frame YOLO actually ran on
+    idle_payload = None     # Last detections, re-sent (without alert) while the scene is static
+    last_ibm_status = "idle"
     
     try:
         while True:
-            success, frame = cap.read()
-            if not success:
-                await asyncio.sleep(0.5)
+            if not latest:
+                await asyncio.sleep(0.01)
+                continue
+            frame = latest.pop()
+
+            # Skip inference on static scenes (e.g. a red light) and keep showing the last detections
+            thumb = motion_thumbnail(frame)
+            if idle_payload is not None and motion_fraction(thumb, reference_thumb) < MOTION_MIN_FRACTION:
+                now = time.monotonic()
+                ibm_status = ibm_agent_status()
+                if last_accident or ibm_status != last_ibm_status or now - last_sent >= WS_SEND_INTERVAL:
+                    idle_payload["ibm_agent_status"] = ibm_status
+                    await websocket.send_bytes(ws_dumps(idle_payload))
+                    last_sent = now
+                    last_accident = False
+                    last_ibm_status = ibm_status
+                await asyncio.sleep(0.05)
                 continue
+            reference_thumb = thumb
+
+            # Run YOLO (on the inference thread so the event loop stays responsive)
+            model_input, scale = prepare_frame(frame)
+            results = await asyncio.get_running_loop().run_in_executor(INFERENCE_POOL, run_inference, model_input)
+            # Pull box tensors to host memory once (one image in -> normally one Results out)
+            boxes = [r.boxes for r in results if len(r.boxes)]
+            if boxes:
+                confs = np.concatenate([b.conf.cpu().numpy() for b in boxes])
+                clss = np.concatenate([b.cls.cpu().numpy() for b in boxes]).astype(np.int32)
+                xyxy = np.concatenate([b.xyxy.cpu().numpy() for b in boxes])
+                if scale != 1.0:
+                    xyxy = xyxy / scale  # Back to original camera coordinates
+            else:
+                confs, clss, xyxy = EMPTY_CONF, EMPTY_CLS, EMPTY_XYXY
+
+            # 🆕 Vehicle types, crash flag and alert trigger in one fused pass
+            counts_by_type, total_vehicles, has_crash, trigger, highest_conf = summarize_detections(clss, confs)
+            accident_detected = bool(trigger.any())
+
+            vehicle_count_by_type = dict(zip(VEHICLE_TYPE_NAMES[:OTHER_TYPE_ID], counts_by_type.tolist()))
+            vehicle_count_by_type["other"] = 0
 
-            # Run YOLO
-            # Lowered confidence to 0.4 to catch more potential accidents
-            results = model(frame, verbose=False, conf=0.4) 
-            accident_detected = False
             detections_list = []
-            vehicle_count_by_type = {"car": 0, "truck": 0, "motorcycle": 0, "bus": 0, "bicycle": 0, "person": 0, "other": 0}
-            total_vehicles = 0
-            highest_conf = 0.0
-            detected_labels = []
-
-            for r in results:
-                for box in r.boxes:
-                    conf = float(box.conf[0])
-                    cls = int(box.cls[0])
-                    label = model.names[cls]
-                    
-                    # 🔍 DEBUG PRINT: Show me EVERYTHING the model sees!
-                    print(f"👀 I SEE: {label} (Confidence: {conf:.2f})") 
-
-                    # 🆕 Classify vehicle type
-                    vehicle_type = classify_vehicle_type(label)
-                    if vehicle_type != "other":
-                        vehicle_count_by_type[vehicle_type] += 1
-                        total_vehicles += 1
-                    
-                    detected_labels.append(label)
-                    detections_list.append({
-                        "label": label, 
-                        "conf": conf, 
-                        "bbox": box.xyxy[0].tolist(),
-                        "type": vehicle_type  # 🆕 Add vehicle type
-                    })
-
-                    # 🚨 TRIGGER CONDITION - SMART CONFIDENCE THRESHOLDS
-                    critical_keywords = ["accident", "crash", "car_crash", "damage", "wreck", "severe", "collision"]
-                    supporting_keywords = ["car", "vehicle", "person"]
-                    
-                    # High-confidence trigger: Critical keywords with >40% confidence
-                    is_critical = any(k in label.lower() for k in critical_keywords)
-                    
-                    # Lower-confidence trigger: Supporting keywords need >70% confidence
-                    is_supporting = any(k in label.lower() for k in supporting_keywords)
-                    
-                    if (is_critical and conf > 0.4) or (is_supporting and conf > 0.7):
-                        accident_detected = True
-                        highest_conf = conf
-                        print(f"🔥 MATCH FOUND! Label: {label} (Confidence: {conf:.2f}) triggered the alert.")
-
-            ibm_status = "idle"
+            debug_boxes = log.isEnabledFor(logging.DEBUG)
+            for cls, conf, bbox in zip(clss.tolist(), confs.tolist(), xyxy):
+                label = CLASS_LABELS[cls]
+
+                # 🔍 DEBUG: Show me EVERYTHING the model sees! (SENTINEL_LOG_LEVEL=DEBUG)
+                if debug_boxes:
+                    log.debug("👀 I SEE: %s (Confidence: %.2f)", label, conf)
+
+                detections_list.append({
+                    "label": label, 
+                    "conf": conf, 
+                    "bbox": bbox,
+                    "type": TYPE_OF_CLS[cls]  # 🆕 Add vehicle type
+                })
+
+            if accident_detected:
+                trigger_label = CLASS_LABELS[clss[trigger][confs[trigger].argmax()]]
+                print(f"🔥 MATCH FOUND! Label: {trigger_label} (Confidence: {highest_conf:.2f}) triggered the alert.")
+
+            # 🆕 Estimate Queue Length (once per frame)
+            queue_length = QueueEstimator.estimate_queue_length(total_vehicles)
+            wait_time = QueueEstimator.estimate_wait_time(total_vehicles)
+
             severity = "NONE"
             
             if accident_detected:
                 current_time = time.time()
                 
                 # 🆕 Calculate Severity Level
-                severity = calculate_accident_severity(total_vehicles, highest_conf, detected_labels)
+                severity = calculate_accident_severity(total_vehicles, highest_conf, has_crash)
                 print(f"🚨 SEVERITY LEVEL: {severity} (Vehicles: {total_vehicles}, Confidence: {highest_conf:.2%})")
                 
                 # 🆕 Track on Heatmap
                 heatmap_tracker.add_incident(CAMERA_LAT, CAMERA_LON, severity)
                 
-                # 🆕 Estimate Queue Length
-                queue_length = QueueEstimator.estimate_queue_length(total_vehicles)
-                wait_time = QueueEstimator.estimate_wait_time(total_vehicles)
                 print(f"📊 QUEUE ANALYSIS: {queue_length:.1f}m length, ~{wait_time}s wait time")
                 
-                # 1. Trigger IBM (Agentic Workflow) with severity
-                res = trigger_ibm_agent(confidence=highest_conf, severity=severity, vehicle_count=total_vehicles)
-                if res["status"] == "triggered":
-                    ibm_status = "active"
+                # 1. Trigger IBM (Agentic Workflow) with severity (Background Task, frames keep flowing)
+                if ibm_trigger_due():
+                    schedule_task(trigger_ibm_agent(confidence=highest_conf, severity=severity, vehicle_count=total_vehicles))
 
                 # 2. Save Evidence & Telegram (Background Thread) with severity
                 # We use a separate cooldown so we don't spam files
                 if current_time - last_snapshot_time > SNAPSHOT_COOLDOWN:
                     last_snapshot_time = current_time
                     frame_copy = frame.copy() # Copy frame so async doesn't mess it up
-                    t = threading.Thread(
-                        target=handle_alert_background,
-                        args=("CRITICAL ACCIDENT", f"Severity: {severity}, Vehicles: {total_vehicles}", frame_copy, severity),
-                        daemon=False  # Wait for thread to complete before shutdown
-                    )
-                    t.start()
-                    print("📸 Evidence capture thread started...", flush=True)
-
-            await websocket.send_json({
+                    schedule_alert("CRITICAL ACCIDENT", f"Severity: {severity}, Vehicles: {total_vehicles}", frame_copy, severity)
+                    print("📸 Evidence capture task started...", flush=True)
+
+            # Coalesce updates: send at most every WS_SEND_INTERVAL unless the alert state changed
+            # (🆕 Feature 3: Incident Heatmap is streamed separately on /ws/heatmap)
+            ibm_status = ibm_agent_status()
+            payload = {
                 "detections": detections_list,
                 "accident_alert": accident_detected,
                 "ibm_agent_status": ibm_status,
                 "severity": severity,  # 🆕 Feature 1: Severity Level
                 "vehicle_count_by_type": vehicle_count_by_type,  # 🆕 Feature 2: Vehicle Types
                 "total_vehicles": total_vehicles,
-                "heatmap_hotspots": heatmap_tracker.get_hotspots(),  # 🆕 Feature 3: Incident Heatmap
                 "queue_info": {  # 🆕 Feature 4: Queue Length & Wait Time
-                    "estimated_queue_length_m": round(QueueEstimator.estimate_queue_length(total_vehicles), 1),
-                    "estimated_wait_time_s": QueueEstimator.estimate_wait_time(total_vehicles),
+                    "estimated_queue_length_m": round(queue_length, 1),
+                    "estimated_wait_time_s": wait_time,
                     "vehicle_count": total_vehicles
                 }
-            })
+            }
+            idle_payload = {**payload, "accident_alert": False, "ibm_agent_status": "idle", "severity": "NONE"}
+
+            now = time.monotonic()
+            state_changed = accident_detected != last_accident or ibm_status != last_ibm_status
+            if state_changed or now - last_sent >= WS_SEND_INTERVAL:
+                await websocket.send_bytes(ws_dumps(payload))
+                last_sent = now
+                last_accident = accident_detected
+                last_ibm_status = ibm_status
 
             await asyncio.sleep(0.05) 
 
     except WebSocketDisconnect:
         print("❌ Frontend Disconnected")
     finally:
-        cap.release()
+        stop_grabber.set()
+        await asyncio.to_thread(grabber.join, 2)
+        if grabber.is_alive():
+            print("⚠️ Camera read still blocked; the grabber releases the capture when it returns")
+
+@app.websocket("/ws/heatmap")
+async def heatmap_endpoint(websocket: WebSocket):
+    """🆕 Feature 3: Incident Heatmap - pushes hotspots only when a new incident is recorded"""
+    await websocket.accept()
+    print("🗺️ Heatmap Client Connected")
+
+    sent_version = -1
+    # The dashboard never sends on this socket, so a completed receive means it went away
+    receiver = asyncio.ensure_future(websocket.receive())
+    try:
+        while True:
+            if heatmap_tracker.version != sent_version:
+                sent_version = heatmap_tracker.version
+                await websocket.send_bytes(ws_dumps({"heatmap_hotspots": heatmap_tracker.get_hotspots()}))
+
+            done, _ = await asyncio.wait({receiver}, timeout=HEATMAP_POLL_INTERVAL)
+            if receiver in done:
+                if receiver.result()["type"] == "websocket.disconnect":
+                    break
+                receiver = asyncio.ensure_future(websocket.receive())
+    except WebSocketDisconnect:
+        pass
+    finally:
+        receiver.cancel()
+        print("❌ Heatmap Client Disconnected")
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    # uvloop + httptools come with uvicorn[standard]; "auto" picks them up and falls back to
+    # asyncio / h11 where they are unavailable (e.g. uvloop on Windows)
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop="auto", http="auto", ws="websockets")
\ No newline at end of file
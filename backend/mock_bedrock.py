@@ -8,14 +8,281 @@ Hackathon: AI for Bharat 2026
 
 import json
 import random
+import sys
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Any, List
+from types import MappingProxyType
+from typing import Dict, Any, List, Mapping, Tuple, Union
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+from severity_numba import severity_score
+
+# Library logger: handlers and levels are configured by the application entry point
 logger = logging.getLogger(__name__)
 
+# JSON encoder: orjson (C extension) when installed, stdlib json otherwise
+try:
+    import orjson
+    
+    def _dumps(obj: Any, indent: bool = True) -> str:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+except ImportError:
+    def _dumps(obj: Any, indent: bool = True) -> str:
+        if indent:
+            return json.dumps(obj, indent=2, ensure_ascii=False)
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+# Indicator scan bitmask (see MockBedrockClient._scan_indicators): one flag per hazard keyword
+# group, with the number of hazard indicators (those raising the severity score) above IND_HAZARD_SHIFT
+IND_FIRE = 1    # "fire" / "explosion"
+IND_INJURY = 2  # "injury" / "casualty"
+IND_DAMAGE = 4  # "severe" / "damage"
+IND_HAZARD_SHIFT = 3
+
+# Severity levels (interned: every table and response shares these exact string objects)
+_SEVERITY_LEVELS: Tuple[str, ...] = tuple(sys.intern(s) for s in ("Critical", "High", "Medium", "Low"))
+
+# Dispatch priority per severity level (single hash lookup for string-keyed callers)
+_PRIORITY_MAP: Mapping[str, str] = MappingProxyType({
+    s: sys.intern(p) for s, p in zip(_SEVERITY_LEVELS, ("IMMEDIATE", "URGENT", "STANDARD", "STANDARD"))
+})
+
+# Index tables for the severity score index (0=Low .. 3=Critical, see severity_score)
+_SEV_TBL: Tuple[str, ...] = _SEVERITY_LEVELS[::-1]
+_PRIO_TBL: Tuple[str, ...] = tuple(_PRIORITY_MAP[s] for s in _SEV_TBL)
+
+# Estimated response time bounds in minutes (inclusive), indexed like _SEV_TBL
+_RESPONSE_BOUNDS: Tuple[Tuple[int, int], ...] = (
+    (20, 30),  # Low: 20-30 minutes
+    (15, 20),  # Medium: 15-20 minutes
+    (10, 15),  # High: 10-15 minutes
+    (8, 12)    # Critical: 8-12 minutes
+)
+
+# Resource types for dispatch
+_RESOURCES: Mapping[str, Mapping[str, int]] = MappingProxyType({
+    "Critical": MappingProxyType({
+        "ambulances": 2,
+        "fire_brigade": 1,
+        "police": 2,
+        "traffic_control": 1
+    }),
+    "High": MappingProxyType({
+        "ambulances": 1,
+        "fire_brigade": 0,
+        "police": 1,
+        "traffic_control": 1
+    }),
+    "Medium": MappingProxyType({
+        "ambulances": 1,
+        "fire_brigade": 0,
+        "police": 1,
+        "traffic_control": 0
+    }),
+    "Low": MappingProxyType({
+        "ambulances": 0,
+        "fire_brigade": 0,
+        "police": 1,
+        "traffic_control": 0
+    })
+})
+
+# Display names for resource types
+_RESOURCE_NAMES: Mapping[str, str] = MappingProxyType({
+    "ambulances": "Ambulances",
+    "fire_brigade": "Fire Brigade Units",
+    "police": "Police Units",
+    "traffic_control": "Traffic Control Officers"
+})
+
+# Medical dispatch strategies by severity
+_DISPATCH_STRATEGIES: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "Critical": (
+        "IMMEDIATE dispatch required. Multi-trauma assessment. Alert trauma center. "
+        "Activate full emergency response protocol. ETA: 8-10 minutes.",
+        "Life-threatening injuries suspected. Deploy all available ambulances with paramedic teams. "
+        "Contact nearest hospital ICU. Prepare OR for emergency procedures.",
+        "Severe crash with potential entrapment. Dispatch fire brigade for extrication. "
+        "Multiple casualty management required. Activate mutual aid from adjacent stations."
+    ),
+    "High": (
+        "Urgent response needed. Moderate injuries likely. Standard ambulance dispatch sufficient. "
+        "Advise hospital to prepare emergency department. ETA: 10-12 minutes.",
+        "Significant vehicle damage detected. Deploy ambulance with basic life support. "
+        "Clear accident scene within 30 minutes for traffic flow. Traffic signal adjustment recommended.",
+        "Injury probability high. Dispatch paramedic unit. Advise drivers to avoid area. "
+        "Coordinate with traffic control for vehicle removal."
+    ),
+    "Medium": (
+        "Standard response appropriate. Minor to moderate injuries expected. "
+        "Single ambulance sufficient. Clear scene quickly to minimize traffic impact.",
+        "Moderate damage without severe injury indicators. Police for traffic management only. "
+        "Expect 15-minute scene duration for documentation.",
+        "Non-critical incident. Police dispatch for incident report. Minor medical support may be needed. "
+        "Traffic flow will resume within 20 minutes."
+    ),
+    "Low": (
+        "Low risk incident. Police dispatch for traffic control. Standard response time acceptable. "
+        "May clear independently if all parties cooperative.",
+        "Minimal damage and low injury risk. Log incident for records. "
+        "Traffic disruption minimal. No immediate medical intervention required.",
+        "Non-emergency incident. Arrange police visit for routine documentation. "
+        "Traffic flow largely unaffected. Handle as routine accident report."
+    )
+})
+
+# Medical considerations by severity
+_MEDICAL_CONSIDERATIONS: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    "Critical": (
+        "Spinal injury protocol mandatory until cleared",
+        "Prepare for multiple casualties triage",
+        "Initiate CPR protocols if needed",
+        "Arrange trauma surgery availability",
+        "Monitor for internal bleeding",
+        "Prepare ICU bed immediately"
+    ),
+    "High": (
+        "Standard trauma assessment protocol",
+        "Monitor vital signs continuously",
+        "Arrange hospital admission capability",
+        "Assess for hidden injuries",
+        "Establish IV access during transport"
+    ),
+    "Medium": (
+        "Basic trauma assessment",
+        "Monitor for delayed shock symptoms",
+        "Hospital observation recommended",
+        "Document all injuries for insurance"
+    ),
+    "Low": (
+        "First aid treatment sufficient",
+        "Advise on follow-up medical consultation",
+        "Document for insurance/legal purposes"
+    )
+})
+
+
+def _format_resources(resources: Mapping[str, int]) -> str:
+    """Format resources dictionary into readable string"""
+    formatted = []
+    
+    for key, value in resources.items():
+        if value > 0:
+            formatted.append(f"{_RESOURCE_NAMES[key]}: {value}")
+    
+    return ", ".join(formatted) if formatted else "Non-emergency response"
+
+
+# Resource strings depend only on severity, so format each one once at import
+_FORMATTED_RESOURCES: Mapping[str, str] = MappingProxyType({
+    severity: _format_resources(resources) for severity, resources in _RESOURCES.items()
+})
+
+# Severity-index views of the resource tables (tuple indexing, no string hashing)
+_RESOURCES_BY_IDX: Tuple[Mapping[str, int], ...] = tuple(_RESOURCES[sev] for sev in _SEV_TBL)
+_FORMATTED_RESOURCES_BY_IDX: Tuple[str, ...] = tuple(_FORMATTED_RESOURCES[sev] for sev in _SEV_TBL)
+
+# Bullet-prefixed medical considerations, indexed like _MEDICAL_CONSIDERATIONS
+_BULLETED_MEDICAL: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    severity: tuple(f"• {item}" for item in items) for severity, items in _MEDICAL_CONSIDERATIONS.items()
+})
+
+# Per-severity response templates, indexed like _SEV_TBL. Keys are in final response order;
+# the None values are filled per call (dict.copy keeps the presized table, so no resizes)
+_RESPONSE_TEMPLATES: Tuple[Mapping[str, Any], ...] = tuple(
+    MappingProxyType({
+        "status": "success",
+        "analysis_timestamp": None,
+        "severity_level": sev,
+        "confidence_score": None,
+        "vehicle_count": None,
+        "dispatch_priority": prio,
+        "dispatch_strategy": None,
+        "resources_needed": fmt,
+        "resources_json": None,
+        "medical_dispatch_instructions": None,
+        "medical_dispatch_list": None,
+        "estimated_response_time_minutes": None,
+        "location": None,
+        "severity_justification": None
+    })
+    for sev, prio, fmt in zip(_SEV_TBL, _PRIO_TBL, _FORMATTED_RESOURCES_BY_IDX)
+)
+
+
+class _Lazy:
+    """String computed by fn(*args) on first str() and cached afterwards"""
+    __slots__ = ("_fn", "_args", "_v")
+    
+    def __init__(self, fn, *args):
+        self._fn = fn
+        self._args = args
+        self._v = None
+    
+    def __str__(self) -> str:
+        if self._v is None:
+            self._v = self._fn(*self._args)
+            self._fn = self._args = None  # Drop references once computed
+        return self._v
+    
+    def __repr__(self) -> str:
+        return repr(str(self))
+
+
+@dataclass(slots=True)
+class AccidentAnalysis:
+    """
+    analyze_accident response returned when called with fast=True.
+    Same fields as the dict response; resources_json is the shared read-only table,
+    converted to plain dicts only at the JSON boundary (to_dict / to_json).
+    severity_justification is built lazily: use str() on it, or read it from to_dict().
+    
+    to_dict() is the supported conversion. pickle and copy.deepcopy work (the copy holds a plain
+    resources_json dict and a computed justification); dataclasses.asdict does not, since it
+    deep-copies the shared mappingproxy field directly.
+    """
+    status: str
+    analysis_timestamp: str
+    severity_level: str
+    confidence_score: float
+    vehicle_count: int
+    dispatch_priority: str
+    dispatch_strategy: str
+    resources_needed: str
+    resources_json: Mapping[str, int]
+    medical_dispatch_instructions: str
+    medical_dispatch_list: List[str]
+    estimated_response_time_minutes: int
+    location: Dict[str, float]
+    severity_justification: Union[str, _Lazy]
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict in the same shape as the default analyze_accident response"""
+        return {
+            "status": self.status,
+            "analysis_timestamp": self.analysis_timestamp,
+            "severity_level": self.severity_level,
+            "confidence_score": self.confidence_score,
+            "vehicle_count": self.vehicle_count,
+            "dispatch_priority": self.dispatch_priority,
+            "dispatch_strategy": self.dispatch_strategy,
+            "resources_needed": self.resources_needed,
+            "resources_json": dict(self.resources_json),
+            "medical_dispatch_instructions": self.medical_dispatch_instructions,
+            "medical_dispatch_list": self.medical_dispatch_list,
+            "estimated_response_time_minutes": self.estimated_response_time_minutes,
+            "location": self.location,
+            "severity_justification": str(self.severity_justification)
+        }
+    
+    def __reduce__(self):
+        # Rebuild from plain values: the shared mappingproxy table can't be pickled or deep-copied
+        return (AccidentAnalysis, tuple(self.to_dict().values()))
+    
+    def to_json(self, indent: bool = False) -> str:
+        """Serialize to JSON (compact unless indent=True)"""
+        return _dumps(self.to_dict(), indent)
+
 
 class MockBedrockClient:
     """
@@ -26,102 +293,19 @@ class MockBedrockClient:
         response = client.analyze_accident(accident_data)
     """
     
-    # Severity levels
-    SEVERITY_LEVELS = ["Critical", "High", "Medium", "Low"]
-    
-    # Resource types for dispatch
-    RESOURCES = {
-        "Critical": {
-            "ambulances": 2,
-            "fire_brigade": 1,
-            "police": 2,
-            "traffic_control": 1
-        },
-        "High": {
-            "ambulances": 1,
-            "fire_brigade": 0,
-            "police": 1,
-            "traffic_control": 1
-        },
-        "Medium": {
-            "ambulances": 1,
-            "fire_brigade": 0,
-            "police": 1,
-            "traffic_control": 0
-        },
-        "Low": {
-            "ambulances": 0,
-            "fire_brigade": 0,
-            "police": 1,
-            "traffic_control": 0
-        }
-    }
+    # Fixed per-instance attributes: no instance __dict__, slot descriptors instead of dict lookups.
+    # Methods can't be replaced per instance (e.g. patch.object(client, "analyze_accident"));
+    # patch them on the class instead. __weakref__ keeps instances weak-referenceable.
+    __slots__ = ("use_mock", "model", "region",
+                 "_rng", "_choice", "_randint", "_uniform", "_sample", "_analyze",
+                 "__weakref__")
     
-    # Medical dispatch strategies by severity
-    DISPATCH_STRATEGIES = {
-        "Critical": [
-            "IMMEDIATE dispatch required. Multi-trauma assessment. Alert trauma center. "
-            "Activate full emergency response protocol. ETA: 8-10 minutes.",
-            "Life-threatening injuries suspected. Deploy all available ambulances with paramedic teams. "
-            "Contact nearest hospital ICU. Prepare OR for emergency procedures.",
-            "Severe crash with potential entrapment. Dispatch fire brigade for extrication. "
-            "Multiple casualty management required. Activate mutual aid from adjacent stations."
-        ],
-        "High": [
-            "Urgent response needed. Moderate injuries likely. Standard ambulance dispatch sufficient. "
-            "Advise hospital to prepare emergency department. ETA: 10-12 minutes.",
-            "Significant vehicle damage detected. Deploy ambulance with basic life support. "
-            "Clear accident scene within 30 minutes for traffic flow. Traffic signal adjustment recommended.",
-            "Injury probability high. Dispatch paramedic unit. Advise drivers to avoid area. "
-            "Coordinate with traffic control for vehicle removal."
-        ],
-        "Medium": [
-            "Standard response appropriate. Minor to moderate injuries expected. "
-            "Single ambulance sufficient. Clear scene quickly to minimize traffic impact.",
-            "Moderate damage without severe injury indicators. Police for traffic management only. "
-            "Expect 15-minute scene duration for documentation.",
-            "Non-critical incident. Police dispatch for incident report. Minor medical support may be needed. "
-            "Traffic flow will resume within 20 minutes."
-        ],
-        "Low": [
-            "Low risk incident. Police dispatch for traffic control. Standard response time acceptable. "
-            "May clear independently if all parties cooperative.",
-            "Minimal damage and low injury risk. Log incident for records. "
-            "Traffic disruption minimal. No immediate medical intervention required.",
-            "Non-emergency incident. Arrange police visit for routine documentation. "
-            "Traffic flow largely unaffected. Handle as routine accident report."
-        ]
-    }
-    
-    # Medical considerations by severity
-    MEDICAL_CONSIDERATIONS = {
-        "Critical": [
-            "Spinal injury protocol mandatory until cleared",
-            "Prepare for multiple casualties triage",
-            "Initiate CPR protocols if needed",
-            "Arrange trauma surgery availability",
-            "Monitor for internal bleeding",
-            "Prepare ICU bed immediately"
-        ],
-        "High": [
-            "Standard trauma assessment protocol",
-            "Monitor vital signs continuously",
-            "Arrange hospital admission capability",
-            "Assess for hidden injuries",
-            "Establish IV access during transport"
-        ],
-        "Medium": [
-            "Basic trauma assessment",
-            "Monitor for delayed shock symptoms",
-            "Hospital observation recommended",
-            "Document all injuries for insurance"
-        ],
-        "Low": [
-            "First aid treatment sufficient",
-            "Advise on follow-up medical consultation",
-            "Document for insurance/legal purposes"
-        ]
-    }
+    # Read-only aliases of the module-level tables (kept for API compatibility)
+    SEVERITY_LEVELS = _SEVERITY_LEVELS
+    RESOURCES = _RESOURCES
+    RESOURCE_NAMES = _RESOURCE_NAMES
+    DISPATCH_STRATEGIES = _DISPATCH_STRATEGIES
+    MEDICAL_CONSIDERATIONS = _MEDICAL_CONSIDERATIONS
     
     def __init__(self, use_mock: bool = True):
         """
@@ -133,9 +317,18 @@ class MockBedrockClient:
         self.use_mock = use_mock
         self.model = "claude-3-sonnet-20240229"
         self.region = "us-east-1"
-        logger.info(f"MockBedrockClient initialized (Mock Mode: {self.use_mock})")
+        # Per-client RNG with pre-bound methods (no shared module-level RNG on the hot path)
+        self._rng = random.Random()
+        self._choice = self._rng.choice
+        self._randint = self._rng.randint
+        self._uniform = self._rng.uniform
+        self._sample = self._rng.sample
+        # Per-client analyzer with every table and RNG method pre-bound (see _build_analyzer)
+        self._analyze = self._build_analyzer()
+        logger.info("MockBedrockClient initialized (Mock Mode: %s)", self.use_mock)
     
-    def analyze_accident(self, accident_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_accident(self, accident_data: Dict[str, Any],
+                         fast: bool = False) -> Union[Dict[str, Any], AccidentAnalysis]:
         """
         Analyze accident data and generate dispatch strategy using mock Claude 3
         
@@ -147,137 +340,133 @@ class MockBedrockClient:
                 - severity_indicators: list of detected issues
                 - timestamp: datetime
                 - image_description: str description of scene
+            fast (bool): If True, return an AccidentAnalysis instead of a dict
         
         Returns:
             dict: Contains dispatch strategy, severity level, resources needed, etc.
         """
-        logger.info(f"Analyzing accident data: confidence={accident_data.get('confidence', 0.8)}")
-        
-        # Extract key information
-        confidence = accident_data.get("confidence", 0.8)
-        vehicle_count = accident_data.get("vehicle_count", 2)
-        severity_indicators = accident_data.get("severity_indicators", [])
-        location = accident_data.get("location", (0.0, 0.0))
-        
-        # Determine severity level based on multiple factors
-        severity = self._calculate_severity(confidence, vehicle_count, severity_indicators)
-        
-        # Generate dispatch strategy
-        dispatch_strategy = self._generate_dispatch_strategy(severity)
-        
-        # Get resources needed
-        resources = self.RESOURCES[severity].copy()
-        
-        # Get medical considerations
-        medical_considerations = random.sample(
-            self.MEDICAL_CONSIDERATIONS[severity],
-            min(3, len(self.MEDICAL_CONSIDERATIONS[severity]))
-        )
-        
-        # Calculate response time based on severity
-        response_time = self._calculate_response_time(severity)
+        return self._analyze(accident_data, datetime.now().isoformat(), fast)
+    
+    def analyze_accident_batch(self, accident_list: List[Dict[str, Any]],
+                               fast: bool = False) -> List[Union[Dict[str, Any], AccidentAnalysis]]:
+        """
+        Analyze several accidents in one call
         
-        # Build response
-        response = {
-            "status": "success",
-            "analysis_timestamp": datetime.now().isoformat(),
-            "severity_level": severity,
-            "confidence_score": round(confidence, 3),
-            "vehicle_count": vehicle_count,
-            "dispatch_priority": "IMMEDIATE" if severity == "Critical" else "URGENT" if severity == "High" else "STANDARD",
-            "dispatch_strategy": dispatch_strategy,
-            "resources_needed": self._format_resources(resources),
-            "resources_json": resources,
-            "medical_dispatch_instructions": "\n".join(
-                [f"• {item}" for item in medical_considerations]
-            ),
-            "medical_dispatch_list": medical_considerations,
-            "estimated_response_time_minutes": response_time,
-            "location": {
-                "latitude": location[0],
-                "longitude": location[1]
-            },
-            "severity_justification": self._get_severity_justification(
-                confidence, vehicle_count, severity_indicators
-            )
-        }
+        Args:
+            accident_list (list): accident_data dicts, as accepted by analyze_accident
+            fast (bool): If True, return AccidentAnalysis instances instead of dicts
         
-        logger.info(f"Analysis complete. Severity: {severity}, Priority: {response['dispatch_priority']}")
-        return response
+        Returns:
+            list: One analyze_accident response per input, sharing a single analysis_timestamp
+        """
+        now_iso = datetime.now().isoformat()
+        analyze = self._analyze
+        return [analyze(accident_data, now_iso, fast) for accident_data in accident_list]
     
-    def _calculate_severity(self, confidence: float, vehicle_count: int, indicators: List[str]) -> str:
+    def _build_analyzer(self):
         """
-        Calculate severity level based on multiple factors
+        Build the single analyze implementation for this client.
+        Tables, kernels and bound RNG methods are captured once as closure cells, so each call
+        skips self.* attribute and method lookups. Only the RNG's bound methods and static
+        functions are captured (never self), so client -> closure does not form a reference cycle.
         """
-        severity_score = 0
+        _SEV = _SEV_TBL
+        _PRIO = _PRIO_TBL
+        _RES = _RESOURCES_BY_IDX
+        _FMT = _FORMATTED_RESOURCES_BY_IDX
+        _TPL = _RESPONSE_TEMPLATES
+        _RB = _RESPONSE_BOUNDS
+        _DS = tuple(_DISPATCH_STRATEGIES[sev] for sev in _SEV_TBL)
+        _MED = tuple(_MEDICAL_CONSIDERATIONS[sev] for sev in _SEV_TBL)
+        _BUL = tuple(_BULLETED_MEDICAL[sev] for sev in _SEV_TBL)
+        _MED_RANGE = tuple((range(len(items)), min(3, len(items))) for items in _MED)
+        _SHIFT = IND_HAZARD_SHIFT
+        _INFO = logging.INFO
+        _scan = MockBedrockClient._scan_indicators
+        _score = severity_score
+        _justify = MockBedrockClient._get_severity_justification
+        _is_enabled = logger.isEnabledFor
+        _log = logger.info
+        _uniform = self._uniform
+        _choice = self._choice
+        _sample = self._sample
+        _randint = self._randint
+        _Result = AccidentAnalysis
+        _LazyStr = _Lazy
         
-        # Confidence score impact (0-0.4 points)
-        if confidence > 0.9:
-            severity_score += 0.3
-        elif confidence > 0.75:
-            severity_score += 0.2
-        else:
-            severity_score += 0.1
+        def analyze(accident_data: Dict[str, Any], now_iso: str,
+                    fast: bool = False) -> Union[Dict[str, Any], AccidentAnalysis]:
+            get = accident_data.get
+            confidence = get("confidence", 0.8)
+            vehicle_count = get("vehicle_count", 2)
+            location = get("location", (0.0, 0.0))
+            
+            log_info = _is_enabled(_INFO)
+            if log_info:
+                _log("Analyzing accident data: confidence=%s", confidence)
+            
+            ind_flags = _scan(get("severity_indicators", ()))
+            sev_idx = _score(confidence, vehicle_count, ind_flags >> _SHIFT, _uniform(-0.05, 0.05))
+            
+            dispatch_strategy = _choice(_DS[sev_idx])
+            considerations = _MED[sev_idx]
+            picks = _sample(*_MED_RANGE[sev_idx])
+            medical_considerations = [considerations[i] for i in picks]
+            bulleted = _BUL[sev_idx]
+            medical_instructions = "\n".join([bulleted[i] for i in picks])
+            response_time = _randint(*_RB[sev_idx])
+            
+            if log_info:
+                _log("Analysis complete. Severity: %s, Priority: %s", _SEV[sev_idx], _PRIO[sev_idx])
+            
+            if fast:
+                return _Result(
+                    "success", now_iso, _SEV[sev_idx], round(confidence, 3), vehicle_count,
+                    _PRIO[sev_idx], dispatch_strategy, _FMT[sev_idx], _RES[sev_idx],
+                    medical_instructions, medical_considerations, response_time,
+                    {"latitude": location[0], "longitude": location[1]},
+                    _LazyStr(_justify, confidence, vehicle_count, ind_flags)
+                )
+            
+            response = _TPL[sev_idx].copy()
+            response["analysis_timestamp"] = now_iso
+            response["confidence_score"] = round(confidence, 3)
+            response["vehicle_count"] = vehicle_count
+            response["dispatch_strategy"] = dispatch_strategy
+            response["resources_json"] = dict(_RES[sev_idx])
+            response["medical_dispatch_instructions"] = medical_instructions
+            response["medical_dispatch_list"] = medical_considerations
+            response["estimated_response_time_minutes"] = response_time
+            response["location"] = {"latitude": location[0], "longitude": location[1]}
+            response["severity_justification"] = _justify(confidence, vehicle_count, ind_flags)
+            return response
         
-        # Vehicle count impact (0-0.3 points)
-        if vehicle_count >= 3:
-            severity_score += 0.3
-        elif vehicle_count == 2:
-            severity_score += 0.2
-        else:
-            severity_score += 0.1
-        
-        # Severity indicators impact (0-0.3 points)
-        hazard_keywords = ["fire", "explosion", "injury", "casualty", "damage", "severe"]
-        hazard_count = sum(1 for ind in indicators if any(kw in ind.lower() for kw in hazard_keywords))
-        severity_score += min(0.3, (hazard_count * 0.1))
-        
-        # Add randomness for simulation (±0.05)
-        severity_score += random.uniform(-0.05, 0.05)
-        severity_score = max(0, min(1, severity_score))  # Clamp between 0-1
-        
-        # Map score to severity level
-        if severity_score >= 0.7:
-            return "Critical"
-        elif severity_score >= 0.5:
-            return "High"
-        elif severity_score >= 0.3:
-            return "Medium"
-        else:
-            return "Low"
-    
-    def _generate_dispatch_strategy(self, severity: str) -> str:
-        """Generate a dispatch strategy based on severity"""
-        return random.choice(self.DISPATCH_STRATEGIES[severity])
+        return analyze
     
-    def _calculate_response_time(self, severity: str) -> int:
-        """Calculate estimated response time in minutes"""
-        base_times = {
-            "Critical": (8, 12),      # 8-12 minutes
-            "High": (10, 15),         # 10-15 minutes
-            "Medium": (15, 20),       # 15-20 minutes
-            "Low": (20, 30)           # 20-30 minutes
-        }
-        min_time, max_time = base_times[severity]
-        return random.randint(min_time, max_time)
-    
-    def _format_resources(self, resources: Dict[str, int]) -> str:
-        """Format resources dictionary into readable string"""
-        formatted = []
-        resource_names = {
-            "ambulances": "Ambulances",
-            "fire_brigade": "Fire Brigade Units",
-            "police": "Police Units",
-            "traffic_control": "Traffic Control Officers"
-        }
-        
-        for key, value in resources.items():
-            if value > 0:
-                formatted.append(f"{resource_names[key]}: {value}")
-        
-        return ", ".join(formatted) if formatted else "Non-emergency response"
+    @staticmethod
+    def _scan_indicators(indicators: List[str]) -> int:
+        """
+        Scan severity indicators once (one .lower() each) into a bitmask:
+        IND_FIRE | IND_INJURY | IND_DAMAGE, plus the hazard indicator count << IND_HAZARD_SHIFT
+        """
+        flags = 0
+        hazard_count = 0
+        for ind in indicators:
+            lo = ind.lower()
+            ind_flags = 0
+            if "fire" in lo or "explosion" in lo:
+                ind_flags |= IND_FIRE
+            if "injury" in lo or "casualty" in lo:
+                ind_flags |= IND_INJURY
+            if "severe" in lo or "damage" in lo:
+                ind_flags |= IND_DAMAGE
+            if ind_flags:  # Any hazard keyword counts towards the severity score
+                flags |= ind_flags
+                hazard_count += 1
+        return flags | (hazard_count << IND_HAZARD_SHIFT)
     
-    def _get_severity_justification(self, confidence: float, vehicle_count: int, indicators: List[str]) -> str:
+    @staticmethod
+    def _get_severity_justification(confidence: float, vehicle_count: int, ind_flags: int) -> str:
         """Provide justification for severity determination"""
         reasons = []
         
@@ -289,13 +478,12 @@ class MockBedrockClient:
         elif vehicle_count == 2:
             reasons.append("Two vehicles involved in accident")
         
-        if indicators:
-            if any("fire" in ind.lower() or "explosion" in ind.lower() for ind in indicators):
-                reasons.append("Fire/explosion hazard detected")
-            if any("injury" in ind.lower() or "casualty" in ind.lower() for ind in indicators):
-                reasons.append("Potential casualties indicated")
-            if any("severe" in ind.lower() or "damage" in ind.lower() for ind in indicators):
-                reasons.append("Significant vehicle damage noted")
+        if ind_flags & IND_FIRE:
+            reasons.append("Fire/explosion hazard detected")
+        if ind_flags & IND_INJURY:
+            reasons.append("Potential casualties indicated")
+        if ind_flags & IND_DAMAGE:
+            reasons.append("Significant vehicle damage noted")
         
         return "Determination based on: " + "; ".join(reasons) if reasons else "Standard accident analysis applied"
     
@@ -336,6 +524,19 @@ class MockBedrockClient:
             "incidents": incidents
         }
     
+    @staticmethod
+    def dumps(response: Union[Dict[str, Any], AccidentAnalysis], indent: bool = True) -> str:
+        """
+        Serialize a response from this client to a JSON string
+        
+        Args:
+            response: dict or AccidentAnalysis returned by the client
+            indent (bool): If True, pretty-print with 2-space indentation; otherwise compact
+        """
+        if isinstance(response, AccidentAnalysis):
+            response = response.to_dict()
+        return _dumps(response, indent)
+    
     def test_connection(self) -> Dict[str, Any]:
         """
         Test connection and basic functionality
@@ -357,6 +558,9 @@ class MockBedrockClient:
 
 # Example usage and testing
 if __name__ == "__main__":
+    # Configure logging for the demo run only
+    logging.basicConfig(level=logging.INFO)
+    
     # Initialize mock client
     client = MockBedrockClient(use_mock=True)
     
@@ -365,7 +569,7 @@ if __name__ == "__main__":
     print("TEST 1: Connection Test")
     print("=" * 60)
     result = client.test_connection()
-    print(json.dumps(result, indent=2))
+    print(client.dumps(result))
     
     # Test 2: Critical accident
     print("\n" + "=" * 60)
@@ -380,7 +584,7 @@ if __name__ == "__main__":
         "image_description": "Multi-vehicle collision at intersection"
     }
     result = client.analyze_accident(critical_accident)
-    print(json.dumps(result, indent=2))
+    print(client.dumps(result))
     
     # Test 3: Low severity accident
     print("\n" + "=" * 60)
@@ -395,14 +599,14 @@ if __name__ == "__main__":
         "image_description": "Single vehicle minor incident"
     }
     result = client.analyze_accident(low_accident)
-    print(json.dumps(result, indent=2))
+    print(client.dumps(result))
     
     # Test 4: Incident history
     print("\n" + "=" * 60)
     print("TEST 4: Incident History")
     print("=" * 60)
     history = client.get_incident_history(limit=5)
-    print(json.dumps(history, indent=2))
+    print(client.dumps(history))
     
     print("\n" + "=" * 60)
     print("All tests completed successfully!")
@@ -0,0 +1,72 @@
+"""
+Severity Scoring Kernel - Numeric core of MockBedrockClient severity scoring
+JIT-compiled with Numba when available, plain Python otherwise
+
+The kernel is compiled at import (set SENTINELX_WARMUP=0 to skip). With cache=True the
+compiled code is stored in __pycache__, so only the first start on a cold cache pays the
+compile time; warm starts and steady-state request throughput are unaffected.
+
+Author: Team Neural
+Hackathon: AI for Bharat 2026
+"""
+
+import os
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional: the kernel then runs as regular Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True, boundscheck=False, error_model="numpy")
+def severity_score(confidence, vehicle_count, hazard_count, jitter):
+    """
+    Score an accident and return its severity index
+    (0=Low, 1=Medium, 2=High, 3=Critical)
+
+    Args:
+        confidence (float): detection confidence (0-1)
+        vehicle_count (int): number of vehicles involved
+        hazard_count (int): number of indicators matching a hazard keyword
+        jitter (float): simulation noise added to the score (±0.05)
+    """
+    score = 0.0
+
+    # Confidence score impact (0-0.3 points)
+    if confidence > 0.9:
+        score += 0.3
+    elif confidence > 0.75:
+        score += 0.2
+    else:
+        score += 0.1
+
+    # Vehicle count impact (0-0.3 points)
+    if vehicle_count >= 3:
+        score += 0.3
+    elif vehicle_count == 2:
+        score += 0.2
+    else:
+        score += 0.1
+
+    # Severity indicators impact (0-0.3 points)
+    score += min(0.3, hazard_count * 0.1)
+
+    score += jitter
+    score = max(0.0, min(1.0, score))  # Clamp between 0-1
+
+    # Branchless threshold mapping: each crossed threshold adds one level
+    return (score >= 0.3) + (score >= 0.5) + (score >= 0.7)
+
+
+# Compile once at import so the first request doesn't pay the JIT cost
+if os.environ.get("SENTINELX_WARMUP", "1") == "1":
+    try:
+        severity_score(0.8, 2, 0, 0.0)
+    except Exception:  # A failed warm-up must not break import; the first real call compiles instead
+        pass
@@ -12,6 +12,11 @@ L.Icon.Default.mergeOptions({
   shadowUrl: require('leaflet/dist/images/marker-shadow.png'),
 });
 
+// The backend sends orjson-encoded JSON as binary WebSocket frames
+const textDecoder = new TextDecoder();
+const parseMessage = (event) =>
+  JSON.parse(typeof event.data === "string" ? event.data : textDecoder.decode(event.data));
+
 function App() {
   const [status, setStatus] = useState("disconnected");
   const [accidentAlert, setAccidentAlert] = useState(false);
@@ -32,6 +37,7 @@ function App() {
 
   useEffect(() => {
     const ws = new WebSocket(BACKEND_URL);
+    ws.binaryType = "arraybuffer";
 
     ws.onopen = () => {
       setStatus("connected");
@@ -44,11 +50,10 @@ function App() {
     };
 
     ws.onmessage = (event) => {
-      const data = JSON.parse(event.data);
+      const data = parseMessage(event);
       setDetections(data.detections || []);
       setSeverity(data.severity || "NONE");  // 🆕 Feature 1
       setVehicleCountByType(data.vehicle_count_by_type || {});  // 🆕 Feature 2
-      setHeatmapHotspots(data.heatmap_hotspots || []);  // 🆕 Feature 3
       setQueueInfo(data.queue_info || {});  // 🆕 Feature 4
       
       // IMPROVED: Make the alert "Sticky"
@@ -89,6 +94,21 @@ function App() {
     // eslint-disable-next-line react-hooks/exhaustive-deps
   }, [accidentAlert, ibmStatus]); 
 
+  // 🆕 Feature 3: Heatmap hotspots arrive on their own socket, only when incidents change
+  useEffect(() => {
+    const heatmapWs = new WebSocket(`${BACKEND_URL}/heatmap`);
+    heatmapWs.binaryType = "arraybuffer";
+
+    heatmapWs.onmessage = (event) => {
+      const data = parseMessage(event);
+      setHeatmapHotspots(data.heatmap_hotspots || []);
+    };
+
+    heatmapWs.onerror = (error) => console.error("Heatmap WebSocket error:", error);
+
+    return () => heatmapWs.close();
+  }, [BACKEND_URL]);
+
   const addLog = (msg) => {
     const time = new Date().toLocaleTimeString();
     setLogs(prev => [`[${time}] ${msg}`, ...prev.slice(0, 5)]);
@@ -199,7 +219,7 @@ function App() {
                       popupAnchor: [0, -32]
                     })}
                   >
-                    <Popup>{hotspot.severity} at {hotspot.time}</Popup>
+                    <Popup>{hotspot.severity} ({hotspot.count || 1} incidents) at {hotspot.time}</Popup>
                   </Marker>
                 );
               })}